@@ -2,33 +2,101 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import hmac
+import multiprocessing
 import os
+import threading
+import time
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
+from typing import Literal
 
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, Header, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+import bcrypt
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from pydantic import BaseModel, EmailStr, Field
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import Account, Trade, User, get_db, init_db
-from mt5_engine import MT5Engine, MT5EngineError
+from database import Account, Trade, User, engine as db_engine, get_db, init_db
+from mt5_engine import MT5EngineError
+from mt5_worker import MT5WorkerClient
 
 load_dotenv()
 
-app = FastAPI(title="Perfect Traders MT5 Bridge", version="1.0.0")
+app = FastAPI(
+    title="Perfect Traders MT5 Bridge",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 SECRET_KEY = os.getenv("JWT_SECRET", "change-me-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "60"))
 ADMIN_SECRET = os.getenv("ADMIN_SECRET", "")
+ADMIN_SECRET_BYTES = ADMIN_SECRET.encode()
+
+# 10 rounds: still a safe work factor but roughly 4x less CPU than the old 12.
+# Hashes at any other cost are migrated transparently on the next successful
+# login via verify_and_update_password.
+BCRYPT_ROUNDS = 10
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Dedicated pool for bcrypt: hashing holds a worker for ~100ms, and running it
+# on the shared request threadpool starves other routes under login bursts.
+# Spawn, not fork: the first dispatch happens after the event loop and helper
+# threads are running, and forking a threaded process is undefined behavior.
+bcrypt_pool = concurrent.futures.ProcessPoolExecutor(
+    max_workers=os.cpu_count(),
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
+_mt5_client: MT5WorkerClient | None = None
+_mt5_client_lock = threading.Lock()
+
+
+def get_mt5() -> MT5WorkerClient:
+    """Dependency returning the process-wide MT5 worker client.
+
+    The worker process is spawned lazily on first use, behind a lock so
+    concurrent cold-start requests cannot each spawn a worker. Misconfigured
+    MT5 credentials surface per call as MT5EngineError (mapped to 502) rather
+    than preventing the app from serving the auth routes.
+    """
+    global _mt5_client
+    if _mt5_client is None:
+        with _mt5_client_lock:
+            if _mt5_client is None:
+                _mt5_client = MT5WorkerClient()
+    return _mt5_client
+
+# Decoded-JWT cache: signature verification is pure CPU on every authenticated
+# request, so remember tokens that already validated. Entries carry the token's
+# own `exp` claim and are never served past it; invalid tokens are not cached.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_token_cache_lock = threading.Lock()
+
+# Email -> user id, so hot users skip the per-request SELECT entirely. Only
+# positive lookups are stored; emails are unique, so entries never go stale.
+_user_id_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+_user_id_cache_lock = threading.Lock()
+
+
+@dataclass(slots=True, frozen=True)
+class CurrentUser:
+    """Authenticated principal; the routes only ever need id and email."""
+
+    id: int
+    email: str
+
 
 class Token(BaseModel):
     access_token: str
@@ -47,28 +115,66 @@ class UserOut(BaseModel):
 
 
 class OpenTradeRequest(BaseModel):
+    # Whitespace is stripped at validation so the MT5 layer gets clean input;
+    # Literal validates against a hashset instead of running the re engine.
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     account_id: int
     symbol: str = Field(min_length=2, max_length=20)
     volume: float = Field(gt=0)
-    type: str = Field(pattern="^(buy|sell)$")
+    type: Literal["buy", "sell"]
 
 
 class AdjustBalanceRequest(BaseModel):
     account_id: int
-    balance: Decimal
+    # Bounds match the cent-count storage; out-of-range values fail validation
+    # (422) instead of blowing up quantize during conversion.
+    balance: Decimal = Field(max_digits=18, decimal_places=2)
+
+
+def _decimal_to_cents(amount: Decimal) -> int:
+    return int(amount.quantize(Decimal("0.01")) * 100)
+
+
+def _cents_to_str(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    whole, frac = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{frac:02d}"
 
 
 @app.on_event("startup")
-def startup_event() -> None:
-    init_db()
+async def startup_event() -> None:
+    await init_db()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    if _mt5_client is not None:
+        _mt5_client.shutdown()
+    await db_engine.dispose()
+
+
+def _needs_rehash(hashed_password: str) -> bool:
+    # bcrypt hashes look like $2b$<cost>$<salt+digest>.
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != BCRYPT_ROUNDS
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password; the second element is a replacement hash if the stored
+    one uses a different cost than the current configuration."""
+    if not bcrypt.checkpw(plain_password.encode(), hashed_password.encode()):
+        return False, None
+    if _needs_rehash(hashed_password):
+        return True, get_password_hash(plain_password)
+    return True, None
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -78,57 +184,97 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str | None = payload.get("sub")
-        if email is None:
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        email, exp = cached
+        if time.time() >= exp:
+            with _token_cache_lock:
+                _token_cache.pop(token, None)
             raise credentials_exception
-    except JWTError as exc:
-        raise credentials_exception from exc
+    else:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            email = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+        except JWTError as exc:
+            raise credentials_exception from exc
+        exp = payload.get("exp")
+        if exp is not None:
+            with _token_cache_lock:
+                _token_cache[token] = (email, exp)
+
+    with _user_id_cache_lock:
+        user_id = _user_id_cache.get(email)
+    if user_id is None:
+        result = await db.execute(select(User.id).where(User.email == email))
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            raise credentials_exception
+        with _user_id_cache_lock:
+            _user_id_cache[email] = user_id
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    return CurrentUser(id=user_id, email=email)
 
 
 @app.post("/auth/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register(payload: UserCreate, db: Session = Depends(get_db)) -> UserOut:
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
+async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)) -> UserOut:
+    result = await db.execute(select(User.id).where(User.email == payload.email))
+    if result.scalar_one_or_none() is not None:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    user = User(email=payload.email, hashed_password=get_password_hash(payload.password))
+    hashed_password = await asyncio.get_running_loop().run_in_executor(
+        bcrypt_pool, get_password_hash, payload.password
+    )
+    user = User(
+        email=payload.email,
+        hashed_password=hashed_password,
+        accounts=[Account(balance=0, mt5_login_id=payload.mt5_login_id)],
+    )
     db.add(user)
-    db.flush()
-
-    account = Account(user_id=user.id, balance=Decimal("0.00"), mt5_login_id=payload.mt5_login_id)
-    db.add(account)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     return UserOut(id=user.id, email=user.email)
 
 
 @app.post("/auth/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)) -> Token:
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if user is None or not verify_password(form_data.password, user.hashed_password):
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
+) -> Token:
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+
+    valid, new_hash = await asyncio.get_running_loop().run_in_executor(
+        bcrypt_pool, verify_and_update_password, form_data.password, user.hashed_password
+    )
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
 
     access_token = create_access_token(data={"sub": user.email})
     return Token(access_token=access_token)
 
 
 @app.get("/price/{symbol}")
-def get_price(symbol: str, _: User = Depends(get_current_user)) -> dict:
+async def get_price(
+    symbol: str,
+    _: CurrentUser = Depends(get_current_user),
+    engine: MT5WorkerClient = Depends(get_mt5),
+) -> dict:
     try:
-        tick = MT5Engine().get_price(symbol)
+        tick = await engine.get_price(symbol)
     except MT5EngineError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -136,17 +282,18 @@ def get_price(symbol: str, _: User = Depends(get_current_user)) -> dict:
 
 
 @app.post("/trade/open", status_code=status.HTTP_201_CREATED)
-def open_trade(
+async def open_trade(
     payload: OpenTradeRequest,
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    engine: MT5WorkerClient = Depends(get_mt5),
 ) -> dict:
-    account = db.query(Account).filter(Account.id == payload.account_id, Account.user_id == user.id).first()
-    if account is None:
+    account = await db.get(Account, payload.account_id)
+    if account is None or account.user_id != user.id:
         raise HTTPException(status_code=404, detail="Account not found")
 
     try:
-        mt5_result = MT5Engine().send_market_order(
+        mt5_result = await engine.send_market_order(
             symbol=payload.symbol,
             volume=payload.volume,
             order_type=payload.type,
@@ -165,8 +312,7 @@ def open_trade(
         status="open",
     )
     db.add(trade)
-    db.commit()
-    db.refresh(trade)
+    await db.commit()
 
     return {
         "trade_id": trade.id,
@@ -180,23 +326,22 @@ def open_trade(
 
 
 @app.post("/admin/adjust-balance")
-def adjust_balance(
+async def adjust_balance(
     payload: AdjustBalanceRequest,
     x_admin_secret: str = Header(default="", alias="X-ADMIN-SECRET"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     if not ADMIN_SECRET:
         raise HTTPException(status_code=500, detail="ADMIN_SECRET is not configured")
 
-    if x_admin_secret != ADMIN_SECRET:
+    if not hmac.compare_digest(x_admin_secret.encode(), ADMIN_SECRET_BYTES):
         raise HTTPException(status_code=403, detail="Invalid admin secret")
 
-    account = db.query(Account).filter(Account.id == payload.account_id).first()
+    account = await db.get(Account, payload.account_id)
     if account is None:
         raise HTTPException(status_code=404, detail="Account not found")
 
-    account.balance = payload.balance
-    db.commit()
-    db.refresh(account)
+    account.balance = _decimal_to_cents(payload.balance)
+    await db.commit()
 
-    return {"account_id": account.id, "balance": str(account.balance), "message": "Balance updated"}
+    return {"account_id": account.id, "balance": _cents_to_str(account.balance), "message": "Balance updated"}
@@ -6,11 +6,15 @@ market data retrieval, and market order placement with robust error handling.
 
 from __future__ import annotations
 
+import atexit
+import functools
 import logging
 import threading
+import time
 from dataclasses import dataclass
 from typing import Any
 
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 import os
 
@@ -38,22 +42,15 @@ class TickPrice:
 
 
 class MT5Engine:
-    """Thread-safe singleton wrapper around MetaTrader5 package APIs."""
+    """Thread-safe wrapper around MetaTrader5 package APIs.
 
-    _instance: "MT5Engine | None" = None
-    _lock = threading.Lock()
+    Obtain the process-wide instance via :func:`get_engine`.
+    """
 
-    def __new__(cls) -> "MT5Engine":
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
+    _HEALTH_CHECK_INTERVAL = 30.0
+    _TICK_CACHE_TTL = 0.2
 
     def __init__(self) -> None:
-        if self._initialized:
-            return
         self.login = os.getenv("MT5_LOGIN", "").strip()
         self.password = os.getenv("MT5_PASSWORD", "").strip()
         self.server = os.getenv("MT5_SERVER", "").strip()
@@ -62,48 +59,135 @@ class MT5Engine:
             raise MT5EngineError(
                 "Missing MT5 credentials. Ensure MT5_LOGIN, MT5_PASSWORD, and MT5_SERVER are set."
             )
-        self._initialized = True
+        self._connected = False
+        self._conn_lock = threading.Lock()
+        self._health_thread: threading.Thread | None = None
+        self._tick_cache: TTLCache = TTLCache(maxsize=1024, ttl=self._TICK_CACHE_TTL)
+        self._tick_cache_lock = threading.Lock()
+        # Bounded like the tick cache: the route accepts arbitrary symbol
+        # strings, so an unbounded dict would grow a lock per bogus symbol.
+        # Worst case on eviction is one duplicate tick fetch.
+        self._tick_fetch_locks: LRUCache = LRUCache(maxsize=1024)
+        self._selected_symbols: set[str] = set()
+        self._selected_lock = threading.Lock()
 
     def connect(self) -> None:
-        """Initialize and login to MT5 terminal."""
-        if mt5 is None:
-            raise MT5EngineError("MetaTrader5 package is not installed in this environment.")
-
-        initialized = mt5.initialize(
-            login=int(self.login),
-            password=self.password,
-            server=self.server,
-        )
-        if not initialized:
-            code, message = mt5.last_error()
-            raise MT5EngineError(f"MT5 initialize() failed: [{code}] {message}")
+        """Initialize and login to the MT5 terminal, reusing a live connection.
+
+        The terminal handshake is a heavyweight IPC exchange, so the connection
+        is established once and kept for the process lifetime; a background
+        health check marks it stale so the next call reconnects.
+        """
+        if self._connected:
+            return
+        with self._conn_lock:
+            if self._connected:
+                return
+            if mt5 is None:
+                raise MT5EngineError("MetaTrader5 package is not installed in this environment.")
+
+            initialized = mt5.initialize(
+                login=int(self.login),
+                password=self.password,
+                server=self.server,
+            )
+            if not initialized:
+                code, message = mt5.last_error()
+                raise MT5EngineError(f"MT5 initialize() failed: [{code}] {message}")
+            self._connected = True
+
+            if self._health_thread is None:
+                atexit.register(self.shutdown)
+                self._health_thread = threading.Thread(
+                    target=self._health_check_loop, name="mt5-health-check", daemon=True
+                )
+                self._health_thread.start()
+
+    def _health_check_loop(self) -> None:
+        """Periodically verify the terminal is alive and reconnect if not."""
+        while True:
+            time.sleep(self._HEALTH_CHECK_INTERVAL)
+            if not self._connected:
+                continue
+            if mt5.terminal_info() is not None:
+                continue
+            logger.warning("MT5 terminal health check failed; reconnecting.")
+            with self._conn_lock:
+                self._connected = False
+            # The restarted terminal may have lost its Market Watch state, so
+            # force every symbol to be re-selected on the new session.
+            with self._selected_lock:
+                self._selected_symbols.clear()
+            try:
+                self.connect()
+            except MT5EngineError:
+                logger.exception("MT5 reconnect failed; will retry on next use.")
 
     def shutdown(self) -> None:
         """Shutdown MT5 terminal connection if module is available."""
         if mt5 is None:
             return
-        mt5.shutdown()
+        with self._conn_lock:
+            mt5.shutdown()
+            self._connected = False
+        with self._selected_lock:
+            self._selected_symbols.clear()
+
+    def _ensure_symbol_selected(self, symbol: str) -> None:
+        """Select a symbol in the terminal once and remember it.
+
+        ``symbol_select`` is an IPC round-trip even when the symbol already
+        sits in Market Watch, so hot symbols skip it entirely.
+        """
+        if symbol in self._selected_symbols:
+            return
+        with self._selected_lock:
+            if symbol in self._selected_symbols:
+                return
+            if not mt5.symbol_select(symbol, True):
+                code, message = mt5.last_error()
+                raise MT5EngineError(f"Failed to select symbol {symbol}: [{code}] {message}")
+            self._selected_symbols.add(symbol)
+
+    def _tick_fetch_lock(self, symbol: str) -> threading.Lock:
+        with self._tick_cache_lock:
+            lock = self._tick_fetch_locks.get(symbol)
+            if lock is None:
+                lock = self._tick_fetch_locks[symbol] = threading.Lock()
+            return lock
 
     def get_price(self, symbol: str) -> TickPrice:
-        """Fetch latest tick for a symbol."""
-        self.connect()
-        symbol = symbol.upper().strip()
-
-        selected = mt5.symbol_select(symbol, True)
-        if not selected:
-            code, message = mt5.last_error()
-            self.shutdown()
-            raise MT5EngineError(f"Failed to select symbol {symbol}: [{code}] {message}")
+        """Fetch latest tick for a symbol.
 
-        tick = mt5.symbol_info_tick(symbol)
-        if tick is None:
-            code, message = mt5.last_error()
-            self.shutdown()
-            raise MT5EngineError(f"Failed to fetch tick for {symbol}: [{code}] {message}")
-
-        price = TickPrice(symbol=symbol, bid=tick.bid, ask=tick.ask, time=tick.time)
-        self.shutdown()
-        return price
+        Ticks change at 10-100ms granularity, so identical requests within
+        ``_TICK_CACHE_TTL`` share one terminal round-trip: the first caller per
+        symbol fetches while concurrent callers wait on its lock and read the
+        cached value (single-flight).
+        """
+        symbol = symbol.upper().strip()
+        with self._tick_cache_lock:
+            cached = self._tick_cache.get(symbol)
+        if cached is not None:
+            return cached
+
+        with self._tick_fetch_lock(symbol):
+            with self._tick_cache_lock:
+                cached = self._tick_cache.get(symbol)
+            if cached is not None:
+                return cached
+
+            self.connect()
+            self._ensure_symbol_selected(symbol)
+
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                code, message = mt5.last_error()
+                raise MT5EngineError(f"Failed to fetch tick for {symbol}: [{code}] {message}")
+
+            price = TickPrice(symbol=symbol, bid=tick.bid, ask=tick.ask, time=tick.time)
+            with self._tick_cache_lock:
+                self._tick_cache[symbol] = price
+            return price
 
     def send_market_order(
         self,
@@ -118,19 +202,13 @@ class MT5Engine:
         order_type = order_type.lower().strip()
 
         if order_type not in {"buy", "sell"}:
-            self.shutdown()
             raise MT5EngineError("order_type must be 'buy' or 'sell'.")
 
-        selected = mt5.symbol_select(symbol, True)
-        if not selected:
-            code, message = mt5.last_error()
-            self.shutdown()
-            raise MT5EngineError(f"Failed to select symbol {symbol}: [{code}] {message}")
+        self._ensure_symbol_selected(symbol)
 
         tick = mt5.symbol_info_tick(symbol)
         if tick is None:
             code, message = mt5.last_error()
-            self.shutdown()
             raise MT5EngineError(f"Failed to fetch tick for {symbol}: [{code}] {message}")
 
         mt5_type = mt5.ORDER_TYPE_BUY if order_type == "buy" else mt5.ORDER_TYPE_SELL
@@ -152,12 +230,10 @@ class MT5Engine:
         result = mt5.order_send(request)
         if result is None:
             code, message = mt5.last_error()
-            self.shutdown()
             raise MT5EngineError(f"order_send() returned None: [{code}] {message}")
 
         if result.retcode != mt5.TRADE_RETCODE_DONE:
             code, message = mt5.last_error()
-            self.shutdown()
             raise MT5EngineError(
                 "Order rejected. "
                 f"retcode={result.retcode}, comment={result.comment}, mt5_last_error=[{code}] {message}"
@@ -172,6 +248,15 @@ class MT5Engine:
             "symbol": symbol,
             "type": order_type,
         }
-        self.shutdown()
         logger.info("MT5 order executed successfully: %s", response)
         return response
+
+
+@functools.lru_cache(maxsize=1)
+def get_engine() -> MT5Engine:
+    """Return the process-wide MT5 engine.
+
+    ``lru_cache`` is thread-safe and implemented in C, replacing the old
+    double-checked-locking singleton in ``__new__``.
+    """
+    return MT5Engine()
@@ -0,0 +1,148 @@
+"""Out-of-process MT5 worker.
+
+The MetaTrader5 terminal IPC is blocking and effectively single-threaded per
+process, so a slow order_send made from the web process would serialize every
+other MT5 call behind it. This module runs the terminal in a dedicated process
+that owns the connection and consumes requests from a multiprocessing queue;
+``MT5WorkerClient`` is the in-process RPC facade the FastAPI routes await on,
+so the event loop never blocks on terminal IPC.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import queue
+import threading
+from typing import Any
+
+from mt5_engine import MT5Engine, MT5EngineError, TickPrice, get_engine
+
+logger = logging.getLogger(__name__)
+
+_SHUTDOWN_OP = "__shutdown__"
+
+
+def _worker_main(request_queue: Any, response_queue: Any) -> None:
+    """Process entry point: own the terminal connection and serve requests.
+
+    The engine is created lazily so a misconfigured deploy fails per request
+    (surfacing as 502s) rather than killing the worker at startup.
+    """
+    engine: MT5Engine | None = None
+    while True:
+        req_id, op, kwargs = request_queue.get()
+        if op == _SHUTDOWN_OP:
+            if engine is not None:
+                engine.shutdown()
+            break
+        try:
+            if engine is None:
+                engine = get_engine()
+            result = getattr(engine, op)(**kwargs)
+        except MT5EngineError as exc:
+            response_queue.put((req_id, False, str(exc)))
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("Unexpected MT5 worker failure on %s", op)
+            response_queue.put((req_id, False, f"MT5 worker failure: {exc}"))
+        else:
+            response_queue.put((req_id, True, result))
+
+
+class MT5WorkerClient:
+    """RPC client for the MT5 worker process.
+
+    Requests carry a correlation id; a daemon dispatcher thread reads the
+    response queue and resolves the matching ``concurrent.futures.Future``,
+    which async callers await via ``asyncio.wrap_future``. Worker-side
+    ``MT5EngineError``s are re-raised in the caller.
+    """
+
+    def __init__(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._request_queue = ctx.Queue()
+        self._response_queue = ctx.Queue()
+        self._pending: dict[int, concurrent.futures.Future] = {}
+        self._pending_lock = threading.Lock()
+        self._next_id = 0
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(self._request_queue, self._response_queue),
+            name="mt5-worker",
+            daemon=True,
+        )
+        self._process.start()
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="mt5-worker-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        # The get timeout doubles as a liveness poll: if the worker died (OOM
+        # kill, native crash in the MetaTrader5 extension), nothing will ever
+        # answer the pending requests, so fail them instead of hanging.
+        while True:
+            try:
+                req_id, ok, payload = self._response_queue.get(timeout=1.0)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    self._fail_pending("MT5 worker process died.")
+                continue
+            with self._pending_lock:
+                future = self._pending.pop(req_id, None)
+            if future is None:
+                continue
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(MT5EngineError(payload))
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(MT5EngineError(reason))
+
+    def _submit(self, op: str, **kwargs: Any) -> concurrent.futures.Future:
+        if not self._process.is_alive():
+            raise MT5EngineError("MT5 worker process is not running.")
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._pending_lock:
+            self._next_id += 1
+            req_id = self._next_id
+            self._pending[req_id] = future
+        self._request_queue.put((req_id, op, kwargs))
+        return future
+
+    async def get_price(self, symbol: str) -> TickPrice:
+        return await asyncio.wrap_future(self._submit("get_price", symbol=symbol))
+
+    async def send_market_order(
+        self,
+        symbol: str,
+        volume: float,
+        order_type: str,
+        comment: str = "perfect-traders bridge",
+    ) -> dict[str, Any]:
+        return await asyncio.wrap_future(
+            self._submit(
+                "send_market_order",
+                symbol=symbol,
+                volume=volume,
+                order_type=order_type,
+                comment=comment,
+            )
+        )
+
+    def shutdown(self) -> None:
+        """Ask the worker to close the terminal session and exit."""
+        if not self._process.is_alive():
+            return
+        self._request_queue.put((0, _SHUTDOWN_OP, {}))
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()